@@ -0,0 +1,246 @@
+"""
+Benchmarks the public API against a throwaway local PostgreSQL cluster.
+
+A temporary cluster is created with initdb and started with pg_ctl, each workload is run through
+Rows and Tables, and the throughput and latency percentiles are printed as JSON. Save runs to
+files and pass one to --compare to see how a change affects each workload. initdb refuses to run
+as root, so run the benchmark as a regular user.
+
+    python benchmark.py --output before.json
+    python benchmark.py --compare before.json
+"""
+import os
+import sys
+import math
+import json
+import time
+import random
+import shutil
+import socket
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from postgresql_manager import Manager, Databases, Tables, Rows
+
+DATABASE = "benchmark"
+TABLE = "benchmark_rows"
+COLUMNS = [
+    {"name": "id", "type": "SERIAL", "is_primary": True},
+    {"name": "name", "type": "VARCHAR"},
+    {"name": "value", "type": "INT"},
+    {"name": "created_at", "type": "DATE"}
+]
+WORKLOADS = ["insert", "list", "exists", "update", "delete", "ddl"]
+
+
+class Cluster:
+    """A temporary PostgreSQL cluster, created with initdb and removed on stop()."""
+
+    def __init__(self, bin_dir: str = None):
+        self.bin_dir = bin_dir
+        self.directory = tempfile.mkdtemp(prefix="postgresql_manager_benchmark_")
+        self.data = os.path.join(self.directory, "data")
+        self.port = Cluster._free_port()
+
+    def _command(self, name: str) -> str:
+        """Returns the path of a PostgreSQL server command."""
+        path = os.path.join(self.bin_dir, name) if self.bin_dir else shutil.which(name)
+        if not path:
+            raise RuntimeError(f"'{name}' not found, pass --pg-bin with the PostgreSQL bin directory.")
+        return path
+
+    @staticmethod
+    def _free_port() -> int:
+        """Returns a TCP port that is free on localhost."""
+        with socket.socket() as sock:
+            sock.bind(("localhost", 0))
+            return sock.getsockname()[1]
+
+    def start(self):
+        """Initializes and starts the cluster, with trust authentication for the 'postgres' user."""
+        subprocess.run([self._command("initdb"), "-D", self.data, "-U", "postgres", "--auth=trust"],
+                       check=True, stdout=subprocess.DEVNULL)
+        options = f"-p {self.port} -k {self.directory} -c listen_addresses=localhost -c fsync=off"
+        subprocess.run([self._command("pg_ctl"), "-D", self.data, "-o", options,
+                        "-l", os.path.join(self.directory, "server.log"), "-w", "start"],
+                       check=True, stdout=subprocess.DEVNULL)
+
+    def stop(self):
+        """Stops the cluster and removes its files."""
+        try:
+            subprocess.run([self._command("pg_ctl"), "-D", self.data, "-m", "fast", "-w", "stop"],
+                           check=False, stdout=subprocess.DEVNULL)
+        finally:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Returns the nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def measure(operation, iterations: int, check: bool = True) -> list:
+    """Runs an operation (called with the iteration number) and returns its latencies in seconds.
+
+    With 'check', an operation returning False is reported as a failure.
+    """
+    latencies = []
+    for iteration in range(iterations):
+        started = time.perf_counter()
+        if operation(iteration) is False and check:
+            raise RuntimeError(f"Operation failed at iteration {iteration}, rerun with --debug for details.")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def result(workload: str, params: dict, latencies: list, rows_per_operation: int = 1) -> dict:
+    """Summarizes the latencies of a workload."""
+    seconds = sum(latencies)
+    return {
+        "workload": workload,
+        "params": params,
+        "operations": len(latencies),
+        "seconds": round(seconds, 6),
+        "ops_per_sec": round(len(latencies) / seconds, 2) if seconds else None,
+        "rows_per_sec": round(len(latencies) * rows_per_operation / seconds, 2) if seconds else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3)
+    }
+
+
+def generate_rows(count: int, rng: random.Random) -> list:
+    """Generates rows for the benchmark table."""
+    return [
+        {"name": f"name-{rng.randrange(1000000)}", "value": rng.randrange(1000), "created_at": "2025-01-01"}
+        for _ in range(count)
+    ]
+
+
+def run(workloads: list, iterations: int, insert_sizes: list, seed_rows: int, seed: int) -> list:
+    """Runs the selected workloads against the configured database and returns their results."""
+    rng = random.Random(seed)
+    results = []
+
+    if not Tables.create(DATABASE, TABLE, columns=COLUMNS, indexes=[{"columns": ["value"]}]):
+        raise RuntimeError("Failed to create the benchmark table.")
+    for start in range(0, seed_rows, 1000):
+        Rows.create(DATABASE, TABLE, generate_rows(min(1000, seed_rows - start), rng))
+
+    if "insert" in workloads:
+        for size in insert_sizes:
+            batches = [generate_rows(size, rng) for _ in range(iterations)]
+            latencies = measure(lambda i: Rows.create(DATABASE, TABLE, batches[i]), iterations)
+            results.append(result("insert", {"rows": size}, latencies, size))
+
+    max_id = Rows.count(DATABASE, TABLE) or 1
+
+    if "list" in workloads:
+        values = [rng.randrange(1000) for _ in range(iterations)]
+        latencies = measure(lambda i: Rows.list(DATABASE, TABLE, {"value >=": values[i]}, limit=100), iterations)
+        results.append(result("list", {"filter": "value >=", "limit": 100}, latencies))
+
+    if "exists" in workloads:
+        ids = [rng.randrange(1, max_id + 1) for _ in range(iterations)]
+        latencies = measure(lambda i: Rows.exists(DATABASE, TABLE, {"id": ids[i]}), iterations, check=False)
+        results.append(result("exists", {"filter": "id ="}, latencies))
+
+    if "update" in workloads:
+        ids = [rng.randrange(1, max_id + 1) for _ in range(iterations)]
+        latencies = measure(lambda i: Rows.update(DATABASE, TABLE, ids[i], {"value": i}), iterations)
+        results.append(result("update", {"filter": "id ="}, latencies))
+
+    if "delete" in workloads:
+        ids = rng.sample(range(1, max_id + 1), min(iterations, max_id))
+        latencies = measure(lambda i: Rows.delete(DATABASE, TABLE, ids[i]), len(ids))
+        results.append(result("delete", {"filter": "id ="}, latencies))
+
+    if "ddl" in workloads:
+        def churn(iteration):
+            name = f"{TABLE}_ddl_{iteration}"
+            return Tables.create(DATABASE, name, columns=COLUMNS) and Tables.delete(DATABASE, name)
+        latencies = measure(churn, iterations)
+        results.append(result("ddl", {"statements": "create + drop"}, latencies))
+
+    Tables.delete(DATABASE, TABLE)
+    return results
+
+
+def compare(baseline: dict, report: dict) -> list:
+    """Compares the results of a report with a baseline report, workload by workload."""
+    previous = {(item["workload"], json.dumps(item["params"], sort_keys=True)): item for item in baseline["results"]}
+    changes = []
+    for item in report["results"]:
+        before = previous.get((item["workload"], json.dumps(item["params"], sort_keys=True)))
+        if not before or not before["ops_per_sec"] or not before["p95_ms"]:
+            continue
+        changes.append({
+            "workload": item["workload"],
+            "params": item["params"],
+            "ops_per_sec_ratio": round(item["ops_per_sec"] / before["ops_per_sec"], 3),
+            "p95_ms_ratio": round(item["p95_ms"] / before["p95_ms"], 3)
+        })
+    return changes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark postgresql_manager against a temporary PostgreSQL cluster.")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help=f"Comma-separated workloads ({', '.join(WORKLOADS)}).")
+    parser.add_argument("--iterations", type=int, default=200, help="Operations per workload.")
+    parser.add_argument("--insert-sizes", default="1,100,1000", help="Comma-separated rows per Rows.create() call.")
+    parser.add_argument("--seed-rows", type=int, default=10000, help="Rows inserted before the read/write workloads.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed, for reproducible runs.")
+    parser.add_argument("--pg-bin", help="Directory of initdb and pg_ctl (default: found on PATH).")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+    parser.add_argument("--compare", help="JSON report of a previous run to compare with.")
+    parser.add_argument("--debug", action="store_true", help="Print postgresql_manager debug messages.")
+    args = parser.parse_args()
+
+    workloads = [workload.strip() for workload in args.workloads.split(",") if workload.strip()]
+    unknown = set(workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"Unknown workloads: {', '.join(sorted(unknown))}")
+
+    cluster = Cluster(args.pg_bin)
+    try:
+        cluster.start()
+        Manager.start(DATABASE, "postgres", "postgres", "localhost", str(cluster.port), debug=args.debug)
+        if not Databases.create(DATABASE):
+            raise RuntimeError("Failed to create the benchmark database.")
+
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "iterations": args.iterations,
+                "seed_rows": args.seed_rows,
+                "seed": args.seed
+            },
+            "results": run(workloads, args.iterations, [int(size) for size in args.insert_sizes.split(",")],
+                           args.seed_rows, args.seed)
+        }
+        Manager.end()
+    finally:
+        cluster.stop()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            report["comparison"] = compare(json.load(file), report)
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
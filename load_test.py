@@ -0,0 +1,212 @@
+"""
+Drives a concurrent mixed read/write workload through Rows and Tables.
+
+N threads (or processes) run randomly chosen operations against a table for a set duration.
+Every interval a JSON line reports the throughput, latency percentiles, error counts and the
+number of connections open on the database, followed by a summary of the whole run.
+
+    python load_test.py --database my_database --workers 200 --duration 60 --mix list=50,exists=20,create=20,update=10
+"""
+import sys
+import json
+import time
+import queue
+import random
+import argparse
+import threading
+import multiprocessing
+from postgresql_manager import Manager, Databases, Tables, Rows
+from benchmark import COLUMNS, percentile, generate_rows
+
+OPERATIONS = ["list", "exists", "count", "create", "update", "delete"]
+
+
+def operation(name: str, database: str, table: str, rng: random.Random, max_id: int, batch_size: int) -> bool:
+    """Runs one operation through the public API and returns whether it succeeded."""
+    if name == "list":
+        return isinstance(Rows.list(database, table, {"value >=": rng.randrange(1000)}, limit=100), list)
+    if name == "exists":
+        # Rows.exists() returns False for both "not found" and an error, so the lookup goes through
+        # Rows.count(), which returns None on error
+        return Rows.count(database, table, {"id": rng.randrange(1, max_id + 1)}) is not None
+    if name == "count":
+        return Rows.count(database, table, {"value": rng.randrange(1000)}) is not None
+    if name == "create":
+        return Rows.create(database, table, generate_rows(batch_size, rng))
+    if name == "update":
+        return Rows.update(database, table, rng.randrange(1, max_id + 1), {"value": rng.randrange(1000)})
+    return Rows.delete(database, table, rng.randrange(1, max_id + 1))
+
+
+def worker(config: dict, seed: int, stop, results):
+    """Runs operations until 'stop' is set, sending (operation, latency, success) batches to 'results'."""
+    Manager.start(config["database"], config["user"], config["password"], config["host"], config["port"],
+                  debug=config["debug"])
+    rng = random.Random(seed)
+    names, weights = list(config["mix"].keys()), list(config["mix"].values())
+    samples, sent_at = [], time.monotonic()
+
+    while not stop.is_set():
+        name = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            success = bool(operation(name, config["database"], config["table"], rng, config["max_id"], config["batch_size"]))
+        except Exception:
+            success = False
+        samples.append((name, time.perf_counter() - started, success))
+
+        if time.monotonic() - sent_at >= 0.5:
+            results.put(samples)
+            samples, sent_at = [], time.monotonic()
+
+    results.put(samples)
+
+
+def connections(database: str) -> int:
+    """Counts the connections open on the database, excluding this one."""
+    conn = Databases.connect(database)
+    if not conn:
+        return -1
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM pg_stat_activity WHERE datname = %s AND pid <> pg_backend_pid();", [database])
+        count = cursor.fetchone()[0]
+        cursor.close()
+        return count
+    except Exception:
+        return -1
+    finally:
+        conn.close()
+
+
+def summarize(samples: list, seconds: float) -> dict:
+    """Summarizes (operation, latency, success) samples over a period of time."""
+    latencies = [latency for _, latency, _ in samples]
+    summary = {
+        "operations": len(samples),
+        "ops_per_sec": round(len(samples) / seconds, 2) if seconds else None,
+        "errors": sum(1 for _, _, success in samples if not success),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "by_operation": {}
+    }
+    for name in sorted({name for name, _, _ in samples}):
+        latencies = [latency for operation_name, latency, _ in samples if operation_name == name]
+        summary["by_operation"][name] = {
+            "operations": len(latencies),
+            "errors": sum(1 for operation_name, _, success in samples if operation_name == name and not success),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3)
+        }
+    return summary
+
+
+def parse_mix(mix: str) -> dict:
+    """Parses 'operation=weight,...' into a dictionary of operation weights."""
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}', expected one of: {', '.join(OPERATIONS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a concurrent mixed workload through postgresql_manager.")
+    parser.add_argument("--database", default="postgres", help="Database to run the workload on.")
+    parser.add_argument("--user", default="postgres")
+    parser.add_argument("--password", default="postgres")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", default="5432")
+    parser.add_argument("--table", default="load_test_rows", help="Table to run the workload on (created if missing).")
+    parser.add_argument("--workers", type=int, default=10, help="Number of concurrent workers.")
+    parser.add_argument("--processes", action="store_true", help="Run workers as processes instead of threads.")
+    parser.add_argument("--duration", type=float, default=30, help="Duration of the run in seconds.")
+    parser.add_argument("--interval", type=float, default=5, help="Seconds between progress reports.")
+    parser.add_argument("--mix", default="list=40,exists=30,count=5,create=15,update=8,delete=2",
+                        help=f"Comma-separated operation=weight pairs ({', '.join(OPERATIONS)}).")
+    parser.add_argument("--batch-size", type=int, default=1, help="Rows per Rows.create() call.")
+    parser.add_argument("--seed-rows", type=int, default=10000, help="Rows inserted when the table is created.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--debug", action="store_true", help="Print postgresql_manager debug messages.")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if not Manager.start(args.database, args.user, args.password, args.host, args.port, debug=args.debug):
+        print("Failed to set configuration.", file=sys.stderr)
+        return 1
+
+    if not Tables.exists(args.database, args.table):
+        if not Tables.create(args.database, args.table, columns=COLUMNS, indexes=[{"columns": ["value"]}]):
+            print(f"Failed to create table '{args.table}'.", file=sys.stderr)
+            return 1
+        rng = random.Random(args.seed)
+        for start in range(0, args.seed_rows, 1000):
+            Rows.create(args.database, args.table, generate_rows(min(1000, args.seed_rows - start), rng))
+
+    # Random ids are drawn from the actual id range, so the workload spreads over the whole table
+    max_ids = Rows.aggregate(args.database, args.table, {"max_id": ("MAX", "id")})
+    max_id = (max_ids[0]["max_id"] if max_ids else None) or 1
+
+    config = {
+        "database": args.database, "user": args.user, "password": args.password, "host": args.host,
+        "port": args.port, "debug": args.debug, "table": args.table, "mix": mix, "batch_size": args.batch_size,
+        "max_id": max_id
+    }
+
+    if args.processes:
+        stop, results, spawn = multiprocessing.Event(), multiprocessing.Queue(), multiprocessing.Process
+    else:
+        stop, results, spawn = threading.Event(), queue.Queue(), threading.Thread
+    workers = [spawn(target=worker, args=(config, args.seed + number, stop, results), daemon=True)
+               for number in range(args.workers)]
+
+    started = time.monotonic()
+    for process in workers:
+        process.start()
+
+    all_samples, interval_samples, reported_at = [], [], started
+    while True:
+        now = time.monotonic()
+        if now - started >= args.duration:
+            stop.set()
+        try:
+            interval_samples.extend(results.get(timeout=0.1))
+        except queue.Empty:
+            pass
+
+        if now - reported_at >= args.interval or (stop.is_set() and not any(w.is_alive() for w in workers)):
+            report = {"elapsed": round(now - started, 1), "workers": args.workers,
+                      "connections": connections(args.database)}
+            report.update(summarize(interval_samples, now - reported_at))
+            del report["by_operation"]
+            print(json.dumps(report), flush=True)
+            all_samples.extend(interval_samples)
+            interval_samples, reported_at = [], now
+
+        if stop.is_set() and not any(w.is_alive() for w in workers):
+            break
+
+    # Drain batches sent by the workers as they stopped
+    while True:
+        try:
+            all_samples.extend(results.get(timeout=0.1))
+        except queue.Empty:
+            break
+
+    summary = {"summary": True, "workers": args.workers, "mode": "processes" if args.processes else "threads",
+               "duration": round(time.monotonic() - started, 1)}
+    summary.update(summarize(all_samples, args.duration))
+    print(json.dumps(summary), flush=True)
+    Manager.end()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
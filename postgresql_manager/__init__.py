@@ -3,5 +3,7 @@ from .databases import Databases
 from .tables import Tables
 from .columns import Columns
 from .rows import Rows
+from .partitions import Partitions
+from .buffers import Buffer
 
-__all__ = ["Manager", "Databases", "Tables", "Columns", "Rows"]
+__all__ = ["Manager", "Databases", "Tables", "Columns", "Rows", "Partitions", "Buffer"]
@@ -0,0 +1,213 @@
+import io
+import time
+import threading
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+from postgresql_manager.databases import Databases
+from postgresql_manager import Manager
+
+class Buffer:
+    """A write-behind buffer flushing rows to a PostgreSQL table from a background thread.
+
+    Rows appended to the buffer are written in batches when 'max_rows', 'max_bytes' or 'max_delay'
+    is reached, instead of one connection and commit per row. Open buffers are flushed by Manager.end().
+    """
+
+    def __init__(self, database_name: str, table_name: str, max_rows: int = 1000, max_bytes: int = 1048576,
+                 max_delay: float = 1.0, max_pending: int = 10000, use_copy: bool = False, on_error=None,
+                 timeout: float = None, lock_timeout: float = None):
+        """
+        :param database_name: Name of the database.
+        :param table_name: Name of the table.
+        :param max_rows: Flush when this many rows are buffered.
+        :param max_bytes: Flush when the buffered values reach approximately this many bytes.
+        :param max_delay: Flush when the oldest buffered row is this many seconds old.
+        :param max_pending: Maximum number of buffered rows; append() blocks beyond it (backpressure).
+        :param use_copy: Write batches with COPY instead of a multi-row INSERT.
+        :param on_error: Optional callback called with (rows, error) for each failed batch.
+        :param timeout: statement_timeout in seconds for each batch. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for each batch. Default: Manager.lock_timeout.
+        """
+        self.database_name = database_name
+        self.table_name = table_name
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self.max_pending = max(max_pending, max_rows)
+        self.use_copy = use_copy
+        self.on_error = on_error
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.failed = []  # Failed batches, as dictionaries with 'rows' and 'error' keys
+
+        self._rows = []
+        self._bytes = 0
+        self._first_at = None
+        self._writing = False
+        self._flush_requested = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=f"Buffer-{table_name}", daemon=True)
+        self._thread.start()
+        Manager.buffers.append(self)
+
+    def append(self, row: dict, timeout: float = None) -> bool:
+        """
+        Adds a row to the buffer, blocking while the buffer is full.
+
+        :param row: Dictionary containing column names as keys and values to insert.
+        :param timeout: Maximum number of seconds to wait for room in the buffer (None waits forever).
+        :return: True if the row was buffered, False if the buffer is closed or the wait timed out.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._closed or len(self._rows) < self.max_pending, timeout):
+                if Manager.debug:
+                    print(f"Timed out waiting for room in the buffer of table '{self.table_name}'.")
+                return False
+            if self._closed:
+                if Manager.debug:
+                    print(f"Buffer of table '{self.table_name}' is closed.")
+                return False
+
+            if not self._rows:
+                self._first_at = time.monotonic()
+                self._condition.notify_all()  # Start the max_delay timer of the background thread
+            self._rows.append(row)
+            self._bytes += sum(len(str(value)) for value in row.values())
+            if len(self._rows) >= self.max_rows or self._bytes >= self.max_bytes:
+                self._condition.notify_all()
+            return True
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Writes the buffered rows now and waits until they are written.
+
+        :param timeout: Maximum number of seconds to wait (None waits forever).
+        :return: True if the buffer was emptied in time, False otherwise. Failed batches are reported in 'failed'.
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(
+                lambda: (not self._rows and not self._writing) or not self._thread.is_alive(), timeout
+            )
+
+    def close(self, timeout: float = None) -> bool:
+        """
+        Flushes the remaining rows and stops the background thread.
+
+        :param timeout: Maximum number of seconds to wait (None waits forever).
+        :return: True if every row was flushed without failures, False otherwise.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+        if self in Manager.buffers:
+            Manager.buffers.remove(self)
+        return not self._thread.is_alive() and not self._rows and not self.failed
+
+    def _ready(self) -> bool:
+        """Checks whether a flush threshold is reached. Must be called with the condition held."""
+        if not self._rows:
+            return False
+        return (self._closed or self._flush_requested
+                or len(self._rows) >= self.max_rows
+                or self._bytes >= self.max_bytes
+                or time.monotonic() - self._first_at >= self.max_delay)
+
+    def _run(self):
+        """Background thread loop: waits for a threshold, then writes the buffered rows."""
+        while True:
+            with self._condition:
+                while not self._ready():
+                    if self._closed:
+                        return
+                    if not self._rows:
+                        self._flush_requested = False
+                        self._condition.notify_all()
+                    delay = None if not self._rows else self.max_delay - (time.monotonic() - self._first_at)
+                    self._condition.wait(delay)
+
+                batch = self._rows[:self.max_rows]
+                self._rows = self._rows[self.max_rows:]
+                self._bytes = sum(len(str(value)) for row in self._rows for value in row.values())
+                self._first_at = time.monotonic() if self._rows else None
+                self._writing = True
+                self._condition.notify_all()  # Wake up producers waiting for room
+
+            try:
+                self._write(batch)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write(self, batch: list) -> bool:
+        """Writes a batch of rows in a single transaction, grouping rows by their set of columns."""
+        groups = {}
+        for row in batch:
+            groups.setdefault(tuple(row.keys()), []).append(row)
+
+        conn = None
+        try:
+            conn = Databases.connect(self.database_name)
+            if not conn:
+                raise ConnectionError(f"Failed to connect to database '{self.database_name}'.")
+
+            cursor = conn.cursor()
+            Databases.set_timeouts(cursor, self.timeout, self.lock_timeout)
+            for columns, rows in groups.items():
+                values = [tuple(row[col] for col in columns) for row in rows]
+                if self.use_copy:
+                    cursor.copy_expert(sql.SQL("COPY {} ({}) FROM STDIN;").format(
+                        sql.Identifier(self.table_name),
+                        sql.SQL(", ").join(map(sql.Identifier, columns))
+                    ), Buffer._copy_data(values))
+                else:
+                    execute_values(cursor, sql.SQL("INSERT INTO {} ({}) VALUES %s;").format(
+                        sql.Identifier(self.table_name),
+                        sql.SQL(", ").join(map(sql.Identifier, columns))
+                    ), values, page_size=len(values))
+            conn.commit()
+            cursor.close()
+
+            if Manager.debug:
+                print(f"{len(batch)} buffered rows inserted successfully into table '{self.table_name}' in database '{self.database_name}'.")
+            return True
+        except Exception as e:
+            if Manager.debug:
+                print(f"Error inserting {len(batch)} buffered rows into table '{self.table_name}' in '{self.database_name}': {e}")
+            self.failed.append({"rows": batch, "error": str(e)})
+            if self.on_error:
+                try:
+                    self.on_error(batch, e)
+                except Exception as callback_error:
+                    if Manager.debug:
+                        print(f"Error in buffer error callback: {callback_error}")
+            return False
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception as close_error:
+                    if Manager.debug:
+                        print(f"Error closing connection: {close_error}")
+
+    @staticmethod
+    def _copy_data(values: list) -> io.StringIO:
+        """Encodes rows in the COPY text format."""
+        lines = []
+        for row in values:
+            fields = []
+            for value in row:
+                if value is None:
+                    fields.append("\\N")
+                elif isinstance(value, bool):
+                    fields.append("t" if value else "f")
+                else:
+                    fields.append(str(value).replace("\\", "\\\\").replace("\t", "\\t")
+                                  .replace("\n", "\\n").replace("\r", "\\r"))
+            lines.append("\t".join(fields))
+        return io.StringIO("\n".join(lines) + "\n")
@@ -1,3 +1,6 @@
+import os
+import json
+import time
 from psycopg2 import sql
 from postgresql_manager.databases import Databases
 from postgresql_manager import Manager
@@ -5,7 +8,7 @@ from postgresql_manager import Manager
 class Columns:
     """A static class for managing PostgreSQL table columns."""
 
-    VALID_COLUMN_TYPES = {"INT", "VARCHAR", "TEXT", "BOOLEAN", "DATE", "FLOAT", "SERIAL"}
+    VALID_COLUMN_TYPES = {"INT", "BIGINT", "VARCHAR", "TEXT", "BOOLEAN", "DATE", "TIMESTAMP", "TIMESTAMPTZ", "FLOAT", "SERIAL", "BIGSERIAL"}
     """
     VALID_COLUMN_TYPES = {
         "SMALLINT", "INTEGER", "INT", "BIGINT", "DECIMAL", "NUMERIC", "REAL", "DOUBLE PRECISION", "SERIAL", "BIGSERIAL",
@@ -21,7 +24,8 @@ class Columns:
     """
 
     @staticmethod
-    def exists(database_name: str, table_name: str, column_name: str) -> bool:
+    def exists(database_name: str, table_name: str, column_name: str,
+               timeout: float = None, lock_timeout: float = None) -> bool:
         """Checks if a column exists in a table within the specified database."""
         conn = None
         try:
@@ -31,6 +35,7 @@ class Columns:
                 return False
 
             cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
             cursor.execute(sql.SQL("""
                 SELECT EXISTS (
                     SELECT 1 FROM information_schema.columns
@@ -54,7 +59,35 @@ class Columns:
                         print(f"Error closing connection: {close_error}")
 
     @staticmethod
-    def create(database_name: str, table_name: str, columns: list[dict]) -> bool:
+    def _definition(column: dict):
+        """Builds the SQL definition ("name TYPE constraints") of a column dictionary.
+
+        Returns None if the column type is not in VALID_COLUMN_TYPES.
+        """
+        name = column.get("name")
+        col_type = column.get("type", "").upper()
+        is_not_null = column.get("is_not_null", True)
+        is_primary = column.get("is_primary", False)
+
+        if col_type not in Columns.VALID_COLUMN_TYPES:
+            if Manager.debug:
+                print(f"Invalid column type '{col_type}' for column '{name}'.")
+            return None
+
+        # Build constraints
+        constraints = []
+        if is_primary:
+            constraints.append("PRIMARY KEY")
+        if is_not_null:
+            constraints.append("NOT NULL")
+
+        column_definition = f"{col_type} {' '.join(constraints)}" if constraints else col_type
+
+        return sql.SQL("{} {}").format(sql.Identifier(name), sql.SQL(column_definition))
+
+    @staticmethod
+    def create(database_name: str, table_name: str, columns: list[dict],
+               timeout: float = None, lock_timeout: float = None) -> bool:
         """Adds multiple columns to a table after validating the column types.
         
         Each column should be a dictionary with keys:
@@ -63,6 +96,8 @@ class Columns:
         - 'is_not_null': (Optional, bool) Default: True
         - 'is_primary': (Optional, bool) Default: False
         - 'comment': (Optional, str) Default: None
+
+        'timeout' and 'lock_timeout' (seconds) default to Manager.timeout and Manager.lock_timeout.
         """
         if not columns:
             if Manager.debug:
@@ -78,33 +113,20 @@ class Columns:
                 return False
 
             cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
 
             for column in columns:
                 name = column.get("name")
-                col_type = column.get("type", "").upper()
-                is_not_null = column.get("is_not_null", True)
-                is_primary = column.get("is_primary", False)
                 comment = column.get("comment")
 
-                if col_type not in Columns.VALID_COLUMN_TYPES:
-                    if Manager.debug:
-                        print(f"Invalid column type '{col_type}' for column '{name}'.")
+                column_definition = Columns._definition(column)
+                if column_definition is None:
                     continue  # Skip invalid column types
 
-                # Build constraints
-                constraints = []
-                if is_primary:
-                    constraints.append("PRIMARY KEY")
-                if is_not_null:
-                    constraints.append("NOT NULL")
-
-                column_definition = f"{col_type} {' '.join(constraints)}" if constraints else col_type
-
                 # Add column to the table
-                query = sql.SQL("ALTER TABLE {} ADD COLUMN {} {};").format(
+                query = sql.SQL("ALTER TABLE {} ADD COLUMN {};").format(
                     sql.Identifier(table_name),
-                    sql.Identifier(name),
-                    sql.SQL(column_definition)
+                    column_definition
                 )
                 cursor.execute(query)
 
@@ -135,7 +157,214 @@ class Columns:
                         print(f"Error closing connection: {close_error}")
 
     @staticmethod
-    def delete(database_name: str, table_name: str, column_name: str) -> bool:
+    def backfill(database_name: str, table_name: str, column: dict, value=None, expression: str = None,
+                 batch_size: int = 10000, sleep: float = 0.0, checkpoint: str = None, progress=None,
+                 key: str = "id", timeout: float = None, lock_timeout: float = None) -> bool:
+        """
+        Adds a column and fills it online, in primary key range batches, without a long exclusive lock.
+
+        The column is added as nullable, then filled batch by batch, each batch in its own transaction.
+        If the column is NOT NULL, a CHECK (column IS NOT NULL) NOT VALID constraint is added, validated
+        without blocking writes, and used by SET NOT NULL to skip the full table scan (PostgreSQL 12+).
+        Writers should set the column on new rows once the backfill starts.
+
+        :param database_name: Name of the database.
+        :param table_name: Name of the table.
+        :param column: Column dictionary, in the same format as Columns.create().
+        :param value: Value to fill the column with. A NOT NULL column needs a value or an expression.
+        :param expression: SQL expression to fill the column with instead of 'value' (e.g., "lower(email)").
+        :param batch_size: Number of key values per batch.
+        :param sleep: Seconds to wait between batches, to throttle the load on the database.
+        :param checkpoint: Optional JSON file where progress is saved; an interrupted backfill resumes from it.
+        :param progress: Optional callback called after each batch with a dictionary of 'last_key', 'max_key',
+                         'rows', 'rows_per_sec', 'percent' and 'eta_seconds'.
+        :param key: Integer primary key column used to split the batches.
+        :param timeout: statement_timeout in seconds for each batch UPDATE. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
+        :return: True if successful, False otherwise.
+        """
+        name = column.get("name")
+        if batch_size <= 0:
+            if Manager.debug:
+                print(f"Invalid batch size {batch_size} for backfilling column '{name}'.")
+            return False
+
+        if column.get("is_primary", False):
+            if Manager.debug:
+                print(f"Cannot backfill primary key column '{name}'.")
+            return False
+
+        if column.get("is_not_null", True) and value is None and expression is None:
+            if Manager.debug:
+                print(f"No value or expression provided to backfill NOT NULL column '{name}'.")
+            return False
+
+        column_definition = Columns._definition({**column, "is_not_null": False})
+        if column_definition is None:
+            return False
+
+        state = {"table": table_name, "column": name, "last_key": None, "rows": 0}
+        conn = None
+        try:
+            if checkpoint and os.path.exists(checkpoint):
+                try:
+                    with open(checkpoint, encoding="utf-8") as file:
+                        saved = json.load(file)
+                    if saved.get("table") == table_name and saved.get("column") == name:
+                        state = saved
+                except (OSError, ValueError) as checkpoint_error:
+                    # Batches only fill NULL values, so starting over is safe
+                    if Manager.debug:
+                        print(f"Ignoring unreadable checkpoint '{checkpoint}': {checkpoint_error}")
+
+            conn = Databases.connect(database_name)
+            if not conn:
+                print(f"Failed to connect to database '{database_name}'.")
+                return False
+
+            cursor = conn.cursor()
+            # lock_timeout holds for every step; statement_timeout only for the batch UPDATEs (set below),
+            # since validating the NOT NULL constraint scans the whole table
+            Databases.set_timeouts(cursor, 0, lock_timeout, local=False)
+
+            # Add the column as nullable: a catalog-only change, no table rewrite
+            if not Columns.exists(database_name, table_name, name, timeout, lock_timeout):
+                cursor.execute(sql.SQL("ALTER TABLE {} ADD COLUMN {};").format(
+                    sql.Identifier(table_name),
+                    column_definition
+                ))
+                if column.get("comment"):
+                    cursor.execute(sql.SQL("COMMENT ON COLUMN {}.{} IS %s;").format(
+                        sql.Identifier(table_name),
+                        sql.Identifier(name)
+                    ), (column.get("comment"),))
+                conn.commit()
+
+            # The UPDATE is run with parameters, so '%' in the expression must not be read as a placeholder
+            fill = sql.SQL(expression.replace("%", "%%")) if expression else sql.Placeholder()
+            fill_params = () if expression else (value,)
+            update_query = sql.SQL("UPDATE {} SET {} = {} WHERE {} > %s AND {} <= %s AND {} IS NULL;").format(
+                sql.Identifier(table_name),
+                sql.Identifier(name),
+                fill,
+                sql.Identifier(key),
+                sql.Identifier(key),
+                sql.Identifier(name)
+            )
+            bounds_query = sql.SQL("SELECT MIN({}), MAX({}) FROM {};").format(
+                sql.Identifier(key),
+                sql.Identifier(key),
+                sql.Identifier(table_name)
+            )
+
+            cursor.execute(bounds_query)
+            min_key, max_key = cursor.fetchone()
+            conn.commit()
+            if state["last_key"] is None:
+                state["last_key"] = (min_key or 0) - 1
+            first_key = state["last_key"]
+            started, done_rows = time.monotonic(), 0
+
+            while max_key is not None and state["last_key"] < max_key:
+                upper_key = state["last_key"] + batch_size
+                Databases.set_timeouts(cursor, timeout, lock_timeout)
+                cursor.execute(update_query, fill_params + (state["last_key"], upper_key))
+                conn.commit()
+
+                done_rows += cursor.rowcount
+                state["rows"] += cursor.rowcount
+                state["last_key"] = upper_key
+                if checkpoint:
+                    Columns._save_checkpoint(checkpoint, state)
+
+                elapsed = time.monotonic() - started
+                done, total = state["last_key"] - first_key, max_key - first_key
+                report = {
+                    "last_key": min(state["last_key"], max_key),
+                    "max_key": max_key,
+                    "rows": state["rows"],
+                    "rows_per_sec": round(done_rows / elapsed, 2) if elapsed else None,
+                    "percent": round(min(100.0, 100.0 * done / total), 2),
+                    "eta_seconds": round(elapsed * max(0, total - done) / done, 1)
+                }
+                if progress:
+                    progress(report)
+                elif Manager.debug:
+                    print(f"Backfill of column '{name}' in table '{table_name}': {report}")
+
+                if state["last_key"] >= max_key:
+                    # Pick up rows inserted since the backfill started
+                    cursor.execute(bounds_query)
+                    max_key = cursor.fetchone()[1]
+                    conn.commit()
+                elif sleep:
+                    time.sleep(sleep)
+
+            if column.get("is_not_null", True):
+                constraint = sql.Identifier(f"{table_name}_{name}_not_null")
+                cursor.execute(sql.SQL("ALTER TABLE {} DROP CONSTRAINT IF EXISTS {};").format(
+                    sql.Identifier(table_name), constraint
+                ))  # Left over by an interrupted backfill
+                cursor.execute(sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} CHECK ({} IS NOT NULL) NOT VALID;").format(
+                    sql.Identifier(table_name), constraint, sql.Identifier(name)
+                ))
+                conn.commit()
+                try:
+                    cursor.execute(sql.SQL("ALTER TABLE {} VALIDATE CONSTRAINT {};").format(
+                        sql.Identifier(table_name), constraint
+                    ))
+                    conn.commit()
+                    cursor.execute(sql.SQL("ALTER TABLE {} ALTER COLUMN {} SET NOT NULL;").format(
+                        sql.Identifier(table_name), sql.Identifier(name)
+                    ))
+                    cursor.execute(sql.SQL("ALTER TABLE {} DROP CONSTRAINT {};").format(
+                        sql.Identifier(table_name), constraint
+                    ))
+                    conn.commit()
+                except Exception:
+                    # Left in place, the constraint would reject every new row with a NULL in the column
+                    try:
+                        conn.rollback()
+                        cursor.execute(sql.SQL("ALTER TABLE {} DROP CONSTRAINT IF EXISTS {};").format(
+                            sql.Identifier(table_name), constraint
+                        ))
+                        conn.commit()
+                    except Exception as drop_error:
+                        if Manager.debug:
+                            print(f"Error dropping constraint of column '{name}' in table '{table_name}': {drop_error}")
+                    raise
+
+            cursor.close()
+            if checkpoint and os.path.exists(checkpoint):
+                os.remove(checkpoint)
+            if Manager.debug:
+                print(f"Column '{name}' backfilled successfully in table '{table_name}' in database '{database_name}' ({state['rows']} rows).")
+            return True
+        except Exception as e:
+            if Manager.debug:
+                print(f"Error backfilling column '{name}' in table '{table_name}' in '{database_name}': {e}")
+            return False
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception as close_error:
+                    if Manager.debug:
+                        print(f"Error closing connection: {close_error}")
+
+    @staticmethod
+    def _save_checkpoint(checkpoint: str, state: dict):
+        """Writes the backfill state to a temporary file and moves it over the checkpoint, so it is never truncated."""
+        temporary = f"{checkpoint}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, checkpoint)
+
+    @staticmethod
+    def delete(database_name: str, table_name: str, column_name: str,
+               timeout: float = None, lock_timeout: float = None) -> bool:
         """Deletes a column from a table."""
         conn = None
         try:
@@ -145,6 +374,7 @@ class Columns:
                 return False
 
             cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
             cursor.execute(sql.SQL("ALTER TABLE {} DROP COLUMN {};").format(
                 sql.Identifier(table_name),
                 sql.Identifier(column_name)
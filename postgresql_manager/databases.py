@@ -1,3 +1,5 @@
+import math
+import threading
 import psycopg2
 from psycopg2 import sql, OperationalError
 from postgresql_manager import Manager
@@ -5,6 +7,10 @@ from postgresql_manager import Manager
 class Databases:
     """A static class for managing PostgreSQL database operations."""
 
+    active = {}
+    """Connections opened by connect(), by thread identifier, so their queries can be cancelled."""
+    _active_lock = threading.Lock()
+
     @staticmethod
     def exists(db_name=None) -> bool:
         """Checks if a PostgreSQL database exists."""
@@ -87,12 +93,89 @@ class Databases:
                 host=Manager.host,
                 port=Manager.port
             )
+            with Databases._active_lock:
+                Databases._prune()
+                thread_id = threading.get_ident()
+                Databases.active[thread_id] = Databases.active.get(thread_id, []) + [conn]
             return conn
         except Exception as e:
             if Manager.debug:
                 print(f"Error connecting to database '{db_name}': {e}")
             return None
 
+    @staticmethod
+    def set_timeouts(cursor, timeout: float = None, lock_timeout: float = None, local: bool = True):
+        """
+        Applies statement_timeout and lock_timeout to the current transaction of a cursor.
+
+        Timeouts are in seconds and default to Manager.timeout and Manager.lock_timeout (None leaves the
+        server setting, 0 disables the timeout). They are set with SET LOCAL and end with the transaction,
+        unless 'local' is False or the connection is in autocommit mode, where they are set for the session.
+        """
+        timeout = Manager.timeout if timeout is None else timeout
+        lock_timeout = Manager.lock_timeout if lock_timeout is None else lock_timeout
+
+        scope = sql.SQL("SET LOCAL") if local and not cursor.connection.autocommit else sql.SQL("SET")
+        statements = []
+        if timeout is not None:
+            statements.append(sql.SQL("{} statement_timeout = {};").format(scope, sql.Literal(Databases._milliseconds(timeout))))
+        if lock_timeout is not None:
+            statements.append(sql.SQL("{} lock_timeout = {};").format(scope, sql.Literal(Databases._milliseconds(lock_timeout))))
+        if statements:
+            cursor.execute(sql.SQL(" ").join(statements))
+
+    @staticmethod
+    def _milliseconds(seconds: float) -> int:
+        """Converts a timeout to milliseconds, rounding positive timeouts up so they never become 0 (disabled)."""
+        return max(1, math.ceil(seconds * 1000)) if seconds > 0 else 0
+
+    @staticmethod
+    def _prune():
+        """Forgets closed connections and threads that have finished. Must be called with _active_lock held."""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for thread_id in list(Databases.active):
+            connections = [c for c in Databases.active[thread_id] if not c.closed]
+            if thread_id in alive and connections:
+                Databases.active[thread_id] = connections
+            else:
+                del Databases.active[thread_id]
+
+    @staticmethod
+    def cancel(thread=None, all_threads: bool = False) -> bool:
+        """
+        Cancels the queries running on connections opened by connect(), from any thread.
+
+        The cancelled call fails as it would on any other database error.
+
+        :param thread: Thread (or thread identifier) whose queries to cancel. Nothing is cancelled for a
+                       thread that has not started yet.
+        :param all_threads: Cancel the queries of every thread instead.
+        :return: True if a cancel request was sent, False otherwise.
+        """
+        thread_id = getattr(thread, "ident", thread)
+        with Databases._active_lock:
+            Databases._prune()
+            if all_threads:
+                connections = [c for conns in Databases.active.values() for c in conns]
+            elif thread_id is not None:
+                connections = list(Databases.active.get(thread_id, []))
+            else:
+                connections = []
+
+        cancelled = False
+        for conn in connections:
+            if conn.closed:
+                continue
+            try:
+                conn.cancel()
+                cancelled = True
+            except Exception as e:
+                if Manager.debug:
+                    print(f"Error cancelling query: {e}")
+        if Manager.debug and cancelled:
+            print("Cancel request sent successfully.")
+        return cancelled
+
     @staticmethod
     def disconnect() -> bool:
         """Closes the active database connection safely."""
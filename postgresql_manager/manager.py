@@ -9,12 +9,19 @@ class Manager:
     host = "localhost"
     port = "5432"
     debug = False
+    timeout = None
+    lock_timeout = None
     
-    con = None
+    conn = None
+    buffers = []
 
     @staticmethod
-    def start(db_name, user_name, password, host, port, debug=False) -> bool:
-        """Configures the database connection parameters."""
+    def start(db_name, user_name, password, host, port, debug=False, timeout=None, lock_timeout=None) -> bool:
+        """Configures the database connection parameters.
+
+        'timeout' and 'lock_timeout' are the default statement_timeout and lock_timeout, in seconds,
+        of the Rows, Tables, Columns and Partitions methods.
+        """
         if not all([db_name, user_name, password, host, port]):
             if debug:
                 print("All parameters must be provided.")
@@ -26,6 +33,8 @@ class Manager:
         Manager.host = host
         Manager.port = port
         Manager.debug = debug
+        Manager.timeout = timeout
+        Manager.lock_timeout = lock_timeout
 
         if debug:
             print("Database configuration updated successfully.")
@@ -33,6 +42,7 @@ class Manager:
 
     @staticmethod
     def end() -> bool:
-        """Closes the database connection if it's open."""
+        """Flushes and closes open row buffers, then closes the database connection if it's open."""
         from postgresql_manager import Databases
-        return Databases.disconnect()
+        flushed = all([buffer.close() for buffer in list(Manager.buffers)])
+        return Databases.disconnect() and flushed
@@ -0,0 +1,296 @@
+import re
+from datetime import date, timedelta
+from psycopg2 import sql
+from postgresql_manager.databases import Databases
+from postgresql_manager.tables import Tables
+from postgresql_manager import Manager
+
+class Partitions:
+    """A static class for managing partitions of PostgreSQL partitioned tables."""
+
+    VALID_INTERVALS = {"DAY", "WEEK", "MONTH", "YEAR"}
+
+    @staticmethod
+    def list(database_name: str, table_name: str, timeout: float = None, lock_timeout: float = None) -> list:
+        """
+        Lists the partitions attached to a partitioned table.
+
+        :param database_name: Name of the database.
+        :param table_name: Name of the partitioned table.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
+        :return: List of dictionaries with the partition 'name' and its 'bound' expression.
+        """
+        conn = None
+        try:
+            conn = Databases.connect(database_name)
+            if not conn:
+                print(f"Failed to connect to database '{database_name}'.")
+                return []
+
+            cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
+            cursor.execute(sql.SQL("""
+                SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = %s
+                ORDER BY child.relname;
+            """), [table_name])
+            partitions = [{"name": name, "bound": bound} for name, bound in cursor.fetchall()]
+            cursor.close()
+            return partitions
+        except Exception as e:
+            if Manager.debug:
+                print(f"Error listing partitions of table '{table_name}' in '{database_name}': {e}")
+            return []
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception as close_error:
+                    if Manager.debug:
+                        print(f"Error closing connection: {close_error}")
+
+    @staticmethod
+    def create(database_name: str, table_name: str, partition_name: str, start=None, end=None, values: list = None,
+               modulus: int = None, remainder: int = None, default: bool = False, timeout: float = None,
+               lock_timeout: float = None) -> bool:
+        """
+        Creates a partition of a partitioned table.
+
+        Exactly one kind of bound must be given, matching the table's partitioning strategy:
+        - RANGE: 'start' (inclusive) and 'end' (exclusive)
+        - LIST: 'values'
+        - HASH: 'modulus' and 'remainder'
+        - Any: 'default=True' for the default partition
+
+        :param database_name: Name of the database.
+        :param table_name: Name of the partitioned table.
+        :param partition_name: Name of the new partition.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
+        :return: True if successful, False otherwise.
+        """
+        if default:
+            bound, params = sql.SQL("DEFAULT"), ()
+        elif start is not None and end is not None:
+            bound, params = sql.SQL("FOR VALUES FROM (%s) TO (%s)"), (start, end)
+        elif values:
+            bound = sql.SQL("FOR VALUES IN ({})").format(sql.SQL(", ").join([sql.Placeholder()] * len(values)))
+            params = tuple(values)
+        elif modulus is not None and remainder is not None:
+            bound, params = sql.SQL("FOR VALUES WITH (MODULUS %s, REMAINDER %s)"), (modulus, remainder)
+        else:
+            if Manager.debug:
+                print(f"No partition bound provided for partition '{partition_name}'.")
+            return False
+
+        conn = None
+        try:
+            conn = Databases.connect(database_name)
+            if not conn:
+                print(f"Failed to connect to database '{database_name}'.")
+                return False
+
+            cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
+            cursor.execute(sql.SQL("CREATE TABLE {} PARTITION OF {} {};").format(
+                sql.Identifier(partition_name),
+                sql.Identifier(table_name),
+                bound
+            ), params)
+            conn.commit()
+            cursor.close()
+            if Manager.debug:
+                print(f"Partition '{partition_name}' of table '{table_name}' created successfully in '{database_name}'.")
+            return True
+        except Exception as e:
+            if Manager.debug:
+                print(f"Error creating partition '{partition_name}' of table '{table_name}' in '{database_name}': {e}")
+            return False
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception as close_error:
+                    if Manager.debug:
+                        print(f"Error closing connection: {close_error}")
+
+    @staticmethod
+    def detach(database_name: str, table_name: str, partition_name: str, concurrently: bool = False,
+               timeout: float = None, lock_timeout: float = None) -> bool:
+        """
+        Detaches a partition from its partitioned table, keeping it as a standalone table.
+
+        :param database_name: Name of the database.
+        :param table_name: Name of the partitioned table.
+        :param partition_name: Name of the partition to detach.
+        :param concurrently: Use DETACH PARTITION CONCURRENTLY (PostgreSQL 14+) to avoid blocking queries on the table.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
+        :return: True if successful, False otherwise.
+        """
+        conn = None
+        try:
+            conn = Databases.connect(database_name)
+            if not conn:
+                print(f"Failed to connect to database '{database_name}'.")
+                return False
+
+            # CONCURRENTLY cannot run inside a transaction block
+            conn.autocommit = concurrently
+            cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
+            cursor.execute(sql.SQL("ALTER TABLE {} DETACH PARTITION {}{};").format(
+                sql.Identifier(table_name),
+                sql.Identifier(partition_name),
+                sql.SQL(" CONCURRENTLY") if concurrently else sql.SQL("")
+            ))
+            if not concurrently:
+                conn.commit()
+            cursor.close()
+            if Manager.debug:
+                print(f"Partition '{partition_name}' detached successfully from table '{table_name}' in '{database_name}'.")
+            return True
+        except Exception as e:
+            if Manager.debug:
+                print(f"Error detaching partition '{partition_name}' from table '{table_name}' in '{database_name}': {e}")
+            return False
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception as close_error:
+                    if Manager.debug:
+                        print(f"Error closing connection: {close_error}")
+
+    @staticmethod
+    def _floor(day: date, interval: str) -> date:
+        """Returns the start of the interval containing the given day."""
+        if interval == "DAY":
+            return day
+        if interval == "WEEK":
+            return day - timedelta(days=day.weekday())
+        if interval == "MONTH":
+            return day.replace(day=1)
+        return day.replace(month=1, day=1)
+
+    @staticmethod
+    def _shift(start: date, interval: str, count: int) -> date:
+        """Moves an interval start forward (or backward) by a number of intervals."""
+        if interval == "DAY":
+            return start + timedelta(days=count)
+        if interval == "WEEK":
+            return start + timedelta(weeks=count)
+        if interval == "MONTH":
+            years, month = divmod(start.month - 1 + count, 12)
+            return start.replace(year=start.year + years, month=month + 1)
+        return start.replace(year=start.year + count)
+
+    @staticmethod
+    def _start(table_name: str, partition_name: str):
+        """Returns the interval start encoded in a '<table_name>_pYYYYMMDD' name, or None for other names."""
+        match = re.match(rf"^{re.escape(table_name)}_p(\d{{4}})(\d{{2}})(\d{{2}})$", partition_name)
+        if not match:
+            return None
+        try:
+            return date(*map(int, match.groups()))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _detached(database_name: str, table_name: str, timeout: float = None, lock_timeout: float = None) -> set:
+        """Returns the names of standalone tables named '<table_name>_pYYYYMMDD', i.e. detached partitions."""
+        conn = None
+        try:
+            conn = Databases.connect(database_name)
+            if not conn:
+                print(f"Failed to connect to database '{database_name}'.")
+                return set()
+
+            cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
+            cursor.execute(sql.SQL("""
+                SELECT relname FROM pg_class
+                WHERE relkind = 'r' AND NOT relispartition AND relname LIKE %s;
+            """), [f"{table_name}_p%"])
+            names = {row[0] for row in cursor.fetchall() if Partitions._start(table_name, row[0])}
+            cursor.close()
+            return names
+        except Exception as e:
+            if Manager.debug:
+                print(f"Error listing detached partitions of table '{table_name}' in '{database_name}': {e}")
+            return set()
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception as close_error:
+                    if Manager.debug:
+                        print(f"Error closing connection: {close_error}")
+
+    @staticmethod
+    def rotate(database_name: str, table_name: str, interval: str = "MONTH", premake: int = 3,
+               retention: int = None, drop: bool = False, today: date = None, timeout: float = None,
+               lock_timeout: float = None) -> bool:
+        """
+        Maintains the time partitions of a RANGE partitioned table.
+
+        Partitions managed by rotate() are named '<table_name>_pYYYYMMDD' after the start of their interval.
+        Partitions for the current interval and the next 'premake' intervals are created if missing.
+        Partitions entirely older than 'retention' intervals are detached, which expires their rows without
+        the cost of a DELETE. With 'drop', they are dropped instead, detaching and dropping in one statement,
+        and expired tables left detached by earlier runs are dropped too.
+
+        :param database_name: Name of the database.
+        :param table_name: Name of the partitioned table.
+        :param interval: Size of each partition ('DAY', 'WEEK', 'MONTH' or 'YEAR').
+        :param premake: Number of future partitions to keep ahead of the current one.
+        :param retention: Number of past intervals to keep, or None to keep every partition.
+        :param drop: Drop expired partitions instead of only detaching them.
+        :param today: Reference day (defaults to today).
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
+        :return: True if every step succeeded, False otherwise.
+        """
+        interval = interval.upper()
+        if interval not in Partitions.VALID_INTERVALS:
+            if Manager.debug:
+                print(f"Invalid partition interval '{interval}'.")
+            return False
+
+        current = Partitions._floor(today or date.today(), interval)
+        existing = {partition["name"] for partition in Partitions.list(database_name, table_name, timeout, lock_timeout)}
+        success = True
+
+        for count in range(premake + 1):
+            start = Partitions._shift(current, interval, count)
+            partition_name = f"{table_name}_p{start:%Y%m%d}"
+            if partition_name in existing:
+                continue
+            end = Partitions._shift(start, interval, 1)
+            success &= Partitions.create(database_name, table_name, partition_name,
+                                         start=start.isoformat(), end=end.isoformat(),
+                                         timeout=timeout, lock_timeout=lock_timeout)
+
+        if retention is None:
+            return success
+
+        cutoff = Partitions._shift(current, interval, -retention)
+        candidates = existing
+        if drop:
+            candidates = existing | Partitions._detached(database_name, table_name, timeout, lock_timeout)
+        for partition_name in sorted(candidates):
+            start = Partitions._start(table_name, partition_name)
+            if not start or Partitions._shift(start, interval, 1) > cutoff:
+                continue
+            if drop:
+                # DROP TABLE on a partition detaches it too, so a failure never leaves a detached table behind
+                success &= Tables.delete(database_name, partition_name, timeout, lock_timeout)
+            else:
+                success &= Partitions.detach(database_name, table_name, partition_name,
+                                             timeout=timeout, lock_timeout=lock_timeout)
+
+        return success
@@ -1,3 +1,6 @@
+import json
+import time
+import select
 from psycopg2 import sql
 from postgresql_manager.databases import Databases
 from postgresql_manager import Manager
@@ -5,14 +8,19 @@ from postgresql_manager import Manager
 class Rows:
     """A static class for managing PostgreSQL table rows."""
 
+    VALID_AGGREGATES = {"COUNT", "SUM", "MIN", "MAX", "AVG"}
+
     @staticmethod
-    def exists(database_name: str, table_name: str, conditions: dict, logical_operator: str = "AND") -> bool:
+    def exists(database_name: str, table_name: str, conditions: dict, logical_operator: str = "AND",
+               timeout: float = None, lock_timeout: float = None) -> bool:
         """Checks if a row exists in a table based on dynamic conditions with AND/OR support.
         
         :param database_name: Name of the database.
         :param table_name: Name of the table.
         :param conditions: Dictionary of column-value pairs for filtering.
         :param logical_operator: Logical operator to combine conditions ('AND' or 'OR').
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
         :return: True if a matching row exists, False otherwise.
         """
         conn = None
@@ -23,6 +31,7 @@ class Rows:
                 return False
 
             cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
 
             # Ensure the logical operator is valid
             logical_operator = logical_operator.upper()
@@ -55,7 +64,41 @@ class Rows:
                         print(f"Error closing connection: {close_error}")
 
     @staticmethod
-    def list(database_name: str, table_name: str, conditions: dict = None, logical_operator: str = "AND", limit: int = 100) -> list:
+    def _where(conditions: dict = None, logical_operator: str = "AND") -> tuple:
+        """Builds a WHERE clause and its parameters from a conditions dictionary, as used by Rows.list().
+
+        Keys are column names, optionally followed by an operator (e.g., "start_time >").
+        Raises ValueError on an invalid operator, so a mistyped condition never widens the query.
+        """
+        query_params = []
+        where_clause = sql.SQL("")
+
+        if conditions:
+            logical_operator = logical_operator.upper()
+            if logical_operator not in ["AND", "OR"]:
+                logical_operator = "AND"
+
+            condition_clauses = []
+            for col, value in conditions.items():
+                if " " in col:  # Check if an operator is included (e.g., "start_time >")
+                    col_name, operator = col.rsplit(" ", 1)
+                    operator = operator.strip()
+                    if operator not in [">", "<", ">=", "<=", "!=", "="]:
+                        raise ValueError(f"Invalid operator '{operator}' in condition '{col}'.")
+                else:
+                    col_name, operator = col, "="  # Default to '=' operator
+                
+                condition_clauses.append(sql.SQL("{} {} %s").format(sql.Identifier(col_name), sql.SQL(operator)))
+                query_params.append(value)
+
+            if condition_clauses:
+                where_clause = sql.SQL(" WHERE ") + sql.SQL(f" {logical_operator} ").join(condition_clauses)
+
+        return where_clause, query_params
+
+    @staticmethod
+    def list(database_name: str, table_name: str, conditions: dict = None, logical_operator: str = "AND", limit: int = 100,
+             timeout: float = None, lock_timeout: float = None) -> list:
         """Retrieves rows from a table based on conditions with AND/OR support and allows operators in conditions.
 
         :param database_name: Name of the database.
@@ -64,6 +107,8 @@ class Rows:
                            and values are the corresponding filter values.
         :param logical_operator: Logical operator to combine conditions ('AND' or 'OR').
         :param limit: Maximum number of rows to retrieve.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
         :return: List of dictionaries representing the rows.
         """
         conn = None
@@ -74,30 +119,10 @@ class Rows:
                 return []
 
             cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
             base_query = sql.SQL("SELECT * FROM {}").format(sql.Identifier(table_name))
 
-            query_params = []
-            where_clause = sql.SQL("")
-
-            if conditions:
-                logical_operator = logical_operator.upper()
-                if logical_operator not in ["AND", "OR"]:
-                    logical_operator = "AND"
-
-                condition_clauses = []
-                for col, value in conditions.items():
-                    if " " in col:  # Check if an operator is included (e.g., "start_time >")
-                        col_name, operator = col.rsplit(" ", 1)
-                        operator = operator.strip()
-                        if operator not in [">", "<", ">=", "<=", "!=", "="]:
-                            continue  # Skip invalid operators
-                    else:
-                        col_name, operator = col, "="  # Default to '=' operator
-                    
-                    condition_clauses.append(sql.SQL("{} {} %s").format(sql.Identifier(col_name), sql.SQL(operator)))
-                    query_params.append(value)
-
-                where_clause = sql.SQL(" WHERE ") + sql.SQL(f" {logical_operator} ").join(condition_clauses)
+            where_clause, query_params = Rows._where(conditions, logical_operator)
 
             query = base_query + where_clause + sql.SQL(" LIMIT %s")
             query_params.append(limit)
@@ -121,13 +146,154 @@ class Rows:
                         print(f"Error closing connection: {close_error}")
 
     @staticmethod
-    def create(database_name: str, table_name: str, data_list: list) -> bool:
+    def count(database_name: str, table_name: str, conditions: dict = None, logical_operator: str = "AND",
+              estimate: bool = False, timeout: float = None, lock_timeout: float = None):
+        """
+        Counts the rows of a table matching the conditions, without transferring them.
+
+        :param database_name: Name of the database.
+        :param table_name: Name of the table.
+        :param conditions: Dictionary of conditions, in the same format as Rows.list().
+        :param logical_operator: Logical operator to combine conditions ('AND' or 'OR').
+        :param estimate: Return the planner's estimate instead of an exact count. Without conditions it is
+                         read from pg_class.reltuples (as of the last VACUUM/ANALYZE), which is instant on huge tables.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
+        :return: Number of matching rows, or None on error.
+        """
+        conn = None
+        try:
+            conn = Databases.connect(database_name)
+            if not conn:
+                print(f"Failed to connect to database '{database_name}'.")
+                return None
+
+            cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
+            where_clause, query_params = Rows._where(conditions, logical_operator)
+
+            count = None
+            if estimate and not query_params:
+                cursor.execute(sql.SQL("""
+                    SELECT reltuples::bigint FROM pg_class
+                    WHERE relname = %s AND relkind = 'r' AND pg_table_is_visible(oid);
+                """), [table_name])
+                row = cursor.fetchone()
+                # reltuples is -1 (PostgreSQL 14+) or 0 (older versions) until the table is first analyzed
+                if row and row[0] > 0:
+                    count = row[0]
+
+            if estimate and count is None:
+                cursor.execute(sql.SQL("EXPLAIN (FORMAT JSON) SELECT 1 FROM {}").format(sql.Identifier(table_name))
+                               + where_clause, tuple(query_params))
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                count = int(plan[0]["Plan"]["Plan Rows"])
+
+            if count is None:
+                cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table_name))
+                               + where_clause, tuple(query_params))
+                count = cursor.fetchone()[0]
+
+            cursor.close()
+            return count
+        except Exception as e:
+            if Manager.debug:
+                print(f"Error counting rows in table '{table_name}' in '{database_name}': {e}")
+            return None
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception as close_error:
+                    if Manager.debug:
+                        print(f"Error closing connection: {close_error}")
+
+    @staticmethod
+    def aggregate(database_name: str, table_name: str, aggregates: dict, conditions: dict = None,
+                  logical_operator: str = "AND", group_by: list = None, timeout: float = None,
+                  lock_timeout: float = None) -> list:
+        """
+        Computes aggregates on the server, optionally grouped by columns.
+
+        :param database_name: Name of the database.
+        :param table_name: Name of the table.
+        :param aggregates: Dictionary where keys are result names and values are (function, column) tuples,
+                           e.g., {"total": ("SUM", "amount"), "rows": ("COUNT", "*")}.
+                           Functions must be in VALID_AGGREGATES.
+        :param conditions: Dictionary of conditions, in the same format as Rows.list().
+        :param logical_operator: Logical operator to combine conditions ('AND' or 'OR').
+        :param group_by: Optional list of column names to group by.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
+        :return: List of dictionaries with the group_by columns and the aggregate results.
+        """
+        if not aggregates:
+            if Manager.debug:
+                print("No aggregates provided.")
+            return []
+
+        conn = None
+        try:
+            select_items = [sql.Identifier(col) for col in group_by or []]
+            for name, (function, column) in aggregates.items():
+                function = function.upper()
+                if function not in Rows.VALID_AGGREGATES:
+                    if Manager.debug:
+                        print(f"Invalid aggregate function '{function}' for '{name}'.")
+                    return []
+                select_items.append(sql.SQL("{}({}) AS {}").format(
+                    sql.SQL(function),
+                    sql.SQL("*") if column == "*" else sql.Identifier(column),
+                    sql.Identifier(name)
+                ))
+
+            conn = Databases.connect(database_name)
+            if not conn:
+                print(f"Failed to connect to database '{database_name}'.")
+                return []
+
+            cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
+            where_clause, query_params = Rows._where(conditions, logical_operator)
+
+            query = sql.SQL("SELECT {} FROM {}").format(
+                sql.SQL(", ").join(select_items),
+                sql.Identifier(table_name)
+            ) + where_clause
+            if group_by:
+                group_columns = sql.SQL(", ").join(map(sql.Identifier, group_by))
+                query += sql.SQL(" GROUP BY {} ORDER BY {}").format(group_columns, group_columns)
+
+            cursor.execute(query, tuple(query_params))
+            columns = [desc[0] for desc in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            cursor.close()
+            return rows
+        except Exception as e:
+            if Manager.debug:
+                print(f"Error aggregating rows from table '{table_name}' in '{database_name}': {e}")
+            return []
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception as close_error:
+                    if Manager.debug:
+                        print(f"Error closing connection: {close_error}")
+
+    @staticmethod
+    def create(database_name: str, table_name: str, data_list: list,
+               timeout: float = None, lock_timeout: float = None) -> bool:
         """
         Inserts multiple rows into the table.
 
         :param database_name: Name of the database.
         :param table_name: Name of the table.
         :param data_list: List of dictionaries containing column names as keys and values to insert.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
         :return: True if successful, False otherwise.
         """
         if not data_list:
@@ -143,6 +309,7 @@ class Rows:
                 return False
 
             cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
 
             # Extract column names from the first dictionary
             columns = list(data_list[0].keys())
@@ -182,13 +349,16 @@ class Rows:
                         print(f"Error closing connection: {close_error}")
 
     @staticmethod
-    def delete(database_name: str, table_name: str, row_id: int) -> bool:
+    def delete(database_name: str, table_name: str, row_id: int,
+               timeout: float = None, lock_timeout: float = None) -> bool:
         """
         Deletes a row from a table by its ID.
 
         :param database_name: Name of the database.
         :param table_name: Name of the table.
         :param row_id: ID of the row to delete.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
         :return: True if deleted successfully, False otherwise.
         """
         conn = None
@@ -199,6 +369,7 @@ class Rows:
                 return False
 
             cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
 
             query = sql.SQL("DELETE FROM {} WHERE id = %s;").format(
                 sql.Identifier(table_name)
@@ -223,7 +394,8 @@ class Rows:
                         print(f"Error closing connection: {close_error}")
 
     @staticmethod
-    def update(database_name: str, table_name: str, row_id: int, update_data: dict) -> bool:
+    def update(database_name: str, table_name: str, row_id: int, update_data: dict,
+               timeout: float = None, lock_timeout: float = None) -> bool:
         """
         Updates a row in the table by its ID.
 
@@ -231,6 +403,8 @@ class Rows:
         :param table_name: Name of the table.
         :param row_id: ID of the row to update.
         :param update_data: Dictionary of column-value pairs to update.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
         :return: True if updated successfully, False otherwise.
         """
         if not update_data:
@@ -246,6 +420,7 @@ class Rows:
                 return False
 
             cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
 
             # Build SET clause dynamically
             set_clauses = [sql.SQL("{} = %s").format(sql.Identifier(col)) for col in update_data.keys()]
@@ -275,3 +450,215 @@ class Rows:
                 except Exception as close_error:
                     if Manager.debug:
                         print(f"Error closing connection: {close_error}")
+
+    @staticmethod
+    def install_watch(database_name: str, table_name: str, channel: str = None, include_row: bool = False,
+                      timeout: float = None, lock_timeout: float = None) -> bool:
+        """
+        Installs a trigger sending a NOTIFY for every inserted, updated or deleted row of a table.
+
+        Each notification payload is a JSON object with the 'table', the 'operation' ('INSERT', 'UPDATE'
+        or 'DELETE') and the row 'id'. Notifications are sent when the writing transaction commits.
+
+        :param database_name: Name of the database.
+        :param table_name: Name of the table.
+        :param channel: Notification channel. Default: '<table_name>_changes'.
+        :param include_row: Also send the whole row as 'row'. Rows too large for a notification (8000 bytes)
+                            are sent without it.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
+        :return: True if installed successfully, False otherwise.
+        """
+        channel = channel or f"{table_name}_changes"
+        conn = None
+        try:
+            conn = Databases.connect(database_name)
+            if not conn:
+                print(f"Failed to connect to database '{database_name}'.")
+                return False
+
+            cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
+
+            row = sql.SQL("to_jsonb(CASE WHEN TG_OP = 'DELETE' THEN OLD ELSE NEW END)")
+            payload = sql.SQL("jsonb_build_object('table', TG_TABLE_NAME, 'operation', TG_OP, 'id', {} -> 'id')").format(row)
+            full_payload = payload + sql.SQL(" || jsonb_build_object('row', {})").format(row) if include_row else payload
+
+            # pg_notify() raises on payloads of 8000 bytes or more, which would abort the writing transaction,
+            # so oversized payloads fall back to the change without its row, then without its id
+            cursor.execute(sql.SQL("""
+                CREATE OR REPLACE FUNCTION {}() RETURNS trigger AS $$
+                DECLARE
+                    payload text := ({})::text;
+                BEGIN
+                    IF octet_length(payload) >= 8000 THEN
+                        payload := ({})::text;
+                    END IF;
+                    IF octet_length(payload) >= 8000 THEN
+                        payload := jsonb_build_object('table', TG_TABLE_NAME, 'operation', TG_OP)::text;
+                    END IF;
+                    PERFORM pg_notify({}, payload);
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+            """).format(
+                sql.Identifier(f"{table_name}_notify"),
+                full_payload,
+                payload,
+                sql.Literal(channel)
+            ))
+            cursor.execute(sql.SQL("DROP TRIGGER IF EXISTS {} ON {};").format(
+                sql.Identifier(f"{table_name}_notify"),
+                sql.Identifier(table_name)
+            ))
+            cursor.execute(sql.SQL("""
+                CREATE TRIGGER {} AFTER INSERT OR UPDATE OR DELETE ON {}
+                FOR EACH ROW EXECUTE PROCEDURE {}();
+            """).format(
+                sql.Identifier(f"{table_name}_notify"),
+                sql.Identifier(table_name),
+                sql.Identifier(f"{table_name}_notify")
+            ))
+            conn.commit()
+            cursor.close()
+            if Manager.debug:
+                print(f"Watch trigger installed successfully on table '{table_name}' in database '{database_name}' (channel '{channel}').")
+            return True
+        except Exception as e:
+            if Manager.debug:
+                print(f"Error installing watch trigger on table '{table_name}' in '{database_name}': {e}")
+            return False
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception as close_error:
+                    if Manager.debug:
+                        print(f"Error closing connection: {close_error}")
+
+    @staticmethod
+    def uninstall_watch(database_name: str, table_name: str, timeout: float = None, lock_timeout: float = None) -> bool:
+        """
+        Removes the trigger installed by Rows.install_watch().
+
+        :param database_name: Name of the database.
+        :param table_name: Name of the table.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
+        :return: True if removed successfully, False otherwise.
+        """
+        conn = None
+        try:
+            conn = Databases.connect(database_name)
+            if not conn:
+                print(f"Failed to connect to database '{database_name}'.")
+                return False
+
+            cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
+            cursor.execute(sql.SQL("DROP TRIGGER IF EXISTS {} ON {};").format(
+                sql.Identifier(f"{table_name}_notify"),
+                sql.Identifier(table_name)
+            ))
+            cursor.execute(sql.SQL("DROP FUNCTION IF EXISTS {}();").format(
+                sql.Identifier(f"{table_name}_notify")
+            ))
+            conn.commit()
+            cursor.close()
+            if Manager.debug:
+                print(f"Watch trigger removed successfully from table '{table_name}' in database '{database_name}'.")
+            return True
+        except Exception as e:
+            if Manager.debug:
+                print(f"Error removing watch trigger from table '{table_name}' in '{database_name}': {e}")
+            return False
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception as close_error:
+                    if Manager.debug:
+                        print(f"Error closing connection: {close_error}")
+
+    @staticmethod
+    def watch(database_name: str, table_name: str, channel: str = None, timeout: float = None,
+              debounce: float = 0.0, max_batch: int = 100):
+        """
+        Yields batches of row changes sent by the trigger of Rows.install_watch(), as they happen.
+
+        The connection socket is waited on with select(), so no query runs while the table is idle.
+        Changes to the same row of the same table within a batch are collapsed into the latest one.
+        The generator only ends quietly after 'timeout' idle seconds. Errors after LISTEN succeeded (e.g. a
+        dropped or terminated connection) are raised, so a dead feed is never mistaken for an idle one.
+
+        :param database_name: Name of the database.
+        :param table_name: Name of the table.
+        :param channel: Notification channel. Default: '<table_name>_changes'.
+        :param timeout: Stop after this many seconds without changes (None watches forever).
+        :param debounce: Seconds to keep collecting changes after the first one before yielding a batch.
+        :param max_batch: Maximum number of changes per batch.
+        :return: Generator of lists of change dictionaries ('table', 'operation', 'id' and optionally 'row').
+        """
+        channel = channel or f"{table_name}_changes"
+        conn = None
+        listening = False
+        try:
+            conn = Databases.connect(database_name)
+            if not conn:
+                print(f"Failed to connect to database '{database_name}'.")
+                return
+
+            conn.autocommit = True
+            cursor = conn.cursor()
+            cursor.execute(sql.SQL("LISTEN {};").format(sql.Identifier(channel)))
+            cursor.close()
+            listening = True
+
+            while True:
+                # Block on the socket until the first change of the batch
+                if not conn.notifies:
+                    if not select.select([conn], [], [], timeout)[0]:
+                        return
+                    conn.poll()
+
+                # Collect more changes until the debounce window ends or the batch is full
+                deadline = time.monotonic() + debounce
+                while len(conn.notifies) < max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not select.select([conn], [], [], remaining)[0]:
+                        break
+                    conn.poll()
+
+                notifies = conn.notifies[:max_batch]
+                del conn.notifies[:max_batch]
+
+                changes = {}
+                for position, notify in enumerate(notifies):
+                    try:
+                        change = json.loads(notify.payload)
+                    except ValueError:
+                        change = None
+                    if not isinstance(change, dict):
+                        change = {"payload": notify.payload}
+                    # Tables sharing a channel can have the same ids, so rows are keyed by table and id
+                    if change.get("id") is not None:
+                        key = ("row", change.get("table"), change["id"])
+                    else:
+                        key = ("position", position)
+                    changes.pop(key, None)  # Keep the latest change of a row, in arrival order
+                    changes[key] = change
+
+                if changes:
+                    yield list(changes.values())
+        except Exception as e:
+            if Manager.debug:
+                print(f"Error watching table '{table_name}' in '{database_name}': {e}")
+            if listening:
+                raise
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception as close_error:
+                    if Manager.debug:
+                        print(f"Error closing connection: {close_error}")
@@ -1,12 +1,18 @@
 from psycopg2 import sql
 from postgresql_manager.databases import Databases
+from postgresql_manager.columns import Columns
 from postgresql_manager import Manager
 
 class Tables:
     """A static class for managing PostgreSQL tables."""
 
+    VALID_CONSTRAINT_TYPES = {"PRIMARY KEY", "UNIQUE", "CHECK", "FOREIGN KEY"}
+    VALID_INDEX_METHODS = {"BTREE", "HASH", "GIN", "GIST", "BRIN"}
+    VALID_REFERENTIAL_ACTIONS = {"CASCADE", "RESTRICT", "SET NULL", "SET DEFAULT", "NO ACTION"}
+    VALID_PARTITION_STRATEGIES = {"RANGE", "LIST", "HASH"}
+
     @staticmethod
-    def exists(database_name: str, table_name: str) -> bool:
+    def exists(database_name: str, table_name: str, timeout: float = None, lock_timeout: float = None) -> bool:
         """Checks if a table exists in the specified database."""
         conn = None
         try:
@@ -16,6 +22,7 @@ class Tables:
                 return False
 
             cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
             cursor.execute(sql.SQL("""
                 SELECT EXISTS (
                     SELECT FROM information_schema.tables 
@@ -38,22 +45,162 @@ class Tables:
                         print(f"Error closing connection: {close_error}")
 
     @staticmethod
-    def create(database_name: str, table_name: str) -> bool:
+    def _constraint(constraint: dict):
+        """Builds the SQL of a table constraint dictionary, or None if it is invalid."""
+        con_type = constraint.get("type", "").upper()
+        name = constraint.get("name")
+        columns = constraint.get("columns", [])
+
+        if con_type not in Tables.VALID_CONSTRAINT_TYPES:
+            if Manager.debug:
+                print(f"Invalid constraint type '{con_type}'.")
+            return None
+
+        if con_type == "CHECK":
+            body = sql.SQL("CHECK ({})").format(sql.SQL(constraint.get("expression", "")))
+        elif con_type == "FOREIGN KEY":
+            on_delete = constraint.get("on_delete", "").upper()
+            body = sql.SQL("FOREIGN KEY ({}) REFERENCES {} ({})").format(
+                sql.SQL(", ").join(map(sql.Identifier, columns)),
+                sql.Identifier(constraint.get("references")),
+                sql.SQL(", ").join(map(sql.Identifier, constraint.get("ref_columns", ["id"])))
+            )
+            if on_delete in Tables.VALID_REFERENTIAL_ACTIONS:
+                body += sql.SQL(" ON DELETE ") + sql.SQL(on_delete)
+        else:
+            body = sql.SQL("{} ({})").format(
+                sql.SQL(con_type),
+                sql.SQL(", ").join(map(sql.Identifier, columns))
+            )
+
+        if name:
+            return sql.SQL("CONSTRAINT {} ").format(sql.Identifier(name)) + body
+        return body
+
+    @staticmethod
+    def _index(table_name: str, index: dict):
+        """Builds the CREATE INDEX statement of an index dictionary, or None if it is invalid."""
+        columns = index.get("columns", [])
+        method = index.get("method", "BTREE").upper()
+        name = index.get("name")
+
+        if not columns or method not in Tables.VALID_INDEX_METHODS:
+            if Manager.debug:
+                print(f"Invalid index {index} on table '{table_name}'.")
+            return None
+
+        return sql.SQL("CREATE {}INDEX {}ON {} USING {} ({});").format(
+            sql.SQL("UNIQUE ") if index.get("unique", False) else sql.SQL(""),
+            sql.SQL("{} ").format(sql.Identifier(name)) if name else sql.SQL(""),
+            sql.Identifier(table_name),
+            sql.SQL(method),
+            sql.SQL(", ").join(map(sql.Identifier, columns))
+        )
+
+    @staticmethod
+    def create(database_name: str, table_name: str, columns: list[dict] = None, constraints: list[dict] = None,
+               indexes: list[dict] = None, unlogged: bool = False, timeout: float = None,
+               lock_timeout: float = None) -> bool:
         """
         Creates a new table in the specified database.
+
+        The table, its columns, constraints, indexes and comments are created in a single transaction.
         
         :param database_name: Database name.
         :param table_name: Name of the table.
-        :param columns: Dictionary where keys are column names and values are PostgreSQL data types.
+        :param columns: List of column dictionaries, in the same format as Columns.create().
+        :param constraints: List of table constraint dictionaries with keys:
+                            - 'type': 'PRIMARY KEY', 'UNIQUE', 'CHECK' or 'FOREIGN KEY'
+                            - 'columns': (Optional, list) Constrained column names
+                            - 'name': (Optional, str) Constraint name
+                            - 'expression': (CHECK only, str) Boolean SQL expression
+                            - 'references': (FOREIGN KEY only, str) Referenced table
+                            - 'ref_columns': (FOREIGN KEY only, list) Default: ['id']
+                            - 'on_delete': (FOREIGN KEY only, str) e.g. 'CASCADE'
+        :param indexes: List of index dictionaries with keys:
+                        - 'columns': Indexed column names (list)
+                        - 'name': (Optional, str) Index name
+                        - 'unique': (Optional, bool) Default: False
+                        - 'method': (Optional, str) Default: 'BTREE'
+        :param unlogged: Create an UNLOGGED table (faster writes, not crash-safe nor replicated).
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
         :return: True if successful, False otherwise.
         """
+        return Tables._create(database_name, table_name, columns, constraints, indexes, unlogged=unlogged,
+                              timeout=timeout, lock_timeout=lock_timeout)
+
+    @staticmethod
+    def create_partitioned(database_name: str, table_name: str, columns: list[dict], partition_by: str,
+                           partition_key: str, constraints: list[dict] = None, indexes: list[dict] = None,
+                           hash_partitions: int = 0, timeout: float = None, lock_timeout: float = None) -> bool:
+        """
+        Creates a new partitioned table in the specified database.
+
+        Partitions are managed through the Partitions class. Conditions on the partition key passed to
+        Rows.list() let the planner skip partitions that cannot match.
+
+        :param database_name: Database name.
+        :param table_name: Name of the table.
+        :param columns: List of column dictionaries, in the same format as Columns.create().
+        :param partition_by: Partitioning strategy ('RANGE', 'LIST' or 'HASH').
+        :param partition_key: Name of the partition key column. Primary keys and unique constraints
+                              must include it.
+        :param constraints: List of table constraint dictionaries, as in Tables.create().
+        :param indexes: List of index dictionaries, as in Tables.create(). They are created on every partition.
+        :param hash_partitions: For 'HASH' tables, number of partitions to create along with the table.
+        :param timeout: statement_timeout in seconds for this call. Default: Manager.timeout.
+        :param lock_timeout: lock_timeout in seconds for this call. Default: Manager.lock_timeout.
+        :return: True if successful, False otherwise.
+        """
+        partition_by = partition_by.upper()
+        if partition_by not in Tables.VALID_PARTITION_STRATEGIES or not partition_key:
+            if Manager.debug:
+                print(f"Invalid partitioning '{partition_by}' on key '{partition_key}' for table '{table_name}'.")
+            return False
+
+        partition_clause = sql.SQL(" PARTITION BY {} ({})").format(
+            sql.SQL(partition_by),
+            sql.Identifier(partition_key)
+        )
+        hash_partitions = hash_partitions if partition_by == "HASH" else 0
+        return Tables._create(database_name, table_name, columns, constraints, indexes,
+                              partition_clause=partition_clause, hash_partitions=hash_partitions,
+                              timeout=timeout, lock_timeout=lock_timeout)
+
+    @staticmethod
+    def _create(database_name: str, table_name: str, columns: list[dict] = None, constraints: list[dict] = None,
+                indexes: list[dict] = None, unlogged: bool = False, partition_clause=None,
+                hash_partitions: int = 0, timeout: float = None, lock_timeout: float = None) -> bool:
+        """Creates a table, its indexes, comments and hash partitions in a single transaction."""
         conn = None
         try:
-            if Tables.exists(database_name, table_name):
+            if Tables.exists(database_name, table_name, timeout, lock_timeout):
                 if Manager.debug:
                     print(f"Table '{table_name}' already exists in '{database_name}'.")
                 return False
 
+            # Build the whole statement before connecting, so nothing is created on invalid input
+            definitions = []
+            for column in columns or []:
+                column_definition = Columns._definition(column)
+                if column_definition is None:
+                    return False
+                definitions.append(column_definition)
+
+            for constraint in constraints or []:
+                constraint_definition = Tables._constraint(constraint)
+                if constraint_definition is None:
+                    return False
+                definitions.append(constraint_definition)
+
+            index_queries = []
+            for index in indexes or []:
+                index_query = Tables._index(table_name, index)
+                if index_query is None:
+                    return False
+                index_queries.append(index_query)
+
             conn = Databases.connect(database_name)
             if not conn:
                 if Manager.debug:
@@ -61,15 +208,37 @@ class Tables:
                 return False
 
             cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
 
-            # Create table without columns
-            query = sql.SQL("CREATE TABLE {} ();").format(sql.Identifier(table_name))
-
+            query = sql.SQL("CREATE {}TABLE {} ({}){};").format(
+                sql.SQL("UNLOGGED ") if unlogged else sql.SQL(""),
+                sql.Identifier(table_name),
+                sql.SQL(", ").join(definitions),
+                partition_clause or sql.SQL("")
+            )
             cursor.execute(query)
+
+            for remainder in range(hash_partitions):
+                cursor.execute(sql.SQL("CREATE TABLE {} PARTITION OF {} FOR VALUES WITH (MODULUS %s, REMAINDER %s);").format(
+                    sql.Identifier(f"{table_name}_p{remainder}"),
+                    sql.Identifier(table_name)
+                ), (hash_partitions, remainder))
+
+            for index_query in index_queries:
+                cursor.execute(index_query)
+
+            for column in columns or []:
+                if column.get("comment"):
+                    comment_query = sql.SQL("COMMENT ON COLUMN {}.{} IS %s;").format(
+                        sql.Identifier(table_name),
+                        sql.Identifier(column.get("name"))
+                    )
+                    cursor.execute(comment_query, (column.get("comment"),))
+
             conn.commit()
             cursor.close()
             if Manager.debug:
-                (f"Table '{table_name}' created successfully in '{database_name}'.")
+                print(f"Table '{table_name}' created successfully in '{database_name}'.")
             return True
         except Exception as e:
             if Manager.debug:
@@ -84,11 +253,11 @@ class Tables:
                         print(f"Error closing connection: {close_error}")
 
     @staticmethod
-    def delete(database_name: str, table_name: str) -> bool:
+    def delete(database_name: str, table_name: str, timeout: float = None, lock_timeout: float = None) -> bool:
         """Deletes a table from the specified database."""
         conn = None
         try:
-            if not Tables.exists(database_name, table_name):
+            if not Tables.exists(database_name, table_name, timeout, lock_timeout):
                 print(f"Table '{table_name}' does not exist in '{database_name}'.")
                 return False
 
@@ -98,6 +267,7 @@ class Tables:
                 return False
 
             cursor = conn.cursor()
+            Databases.set_timeouts(cursor, timeout, lock_timeout)
             cursor.execute(sql.SQL("DROP TABLE {};").format(sql.Identifier(table_name)))
             conn.commit()
             cursor.close()
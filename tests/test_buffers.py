@@ -0,0 +1,67 @@
+import time
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from postgresql_manager import Buffer
+
+
+class RecordingBuffer(Buffer):
+    """A Buffer recording its batches instead of writing them to a database."""
+
+    def __init__(self, *args, **kwargs):
+        self.batches = []
+        super().__init__("database", "table", *args, **kwargs)
+
+    def _write(self, batch: list) -> bool:
+        self.batches.append(batch)
+        return True
+
+
+def wait_for_batches(buffer: RecordingBuffer, count: int, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while len(buffer.batches) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return len(buffer.batches) >= count
+
+
+def test_flushes_when_max_rows_is_reached():
+    buffer = RecordingBuffer(max_rows=3, max_delay=60)
+    try:
+        for value in range(3):
+            assert buffer.append({"value": value})
+        assert wait_for_batches(buffer, 1)
+        assert buffer.batches[0] == [{"value": 0}, {"value": 1}, {"value": 2}]
+    finally:
+        buffer.close()
+
+
+def test_flushes_when_max_bytes_is_reached():
+    buffer = RecordingBuffer(max_rows=1000, max_bytes=10, max_delay=60)
+    try:
+        assert buffer.append({"value": "x" * 5})
+        time.sleep(0.1)
+        assert buffer.batches == []
+        assert buffer.append({"value": "y" * 5})
+        assert wait_for_batches(buffer, 1)
+        assert len(buffer.batches[0]) == 2
+    finally:
+        buffer.close()
+
+
+def test_flushes_when_max_delay_is_reached_after_being_empty():
+    buffer = RecordingBuffer(max_rows=1000, max_delay=0.2)
+    try:
+        time.sleep(0.1)  # Let the background thread wait on an empty buffer
+        assert buffer.append({"value": 1})
+        assert wait_for_batches(buffer, 1, timeout=1.0)
+        assert buffer.batches[0] == [{"value": 1}]
+    finally:
+        buffer.close()
+
+
+def test_close_flushes_remaining_rows():
+    buffer = RecordingBuffer(max_rows=1000, max_delay=60)
+    assert buffer.append({"value": 1})
+    assert buffer.close()
+    assert buffer.batches == [[{"value": 1}]]
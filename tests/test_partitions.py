@@ -0,0 +1,57 @@
+from datetime import date
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from postgresql_manager import Partitions
+
+
+@pytest.mark.parametrize("interval, expected", [
+    ("DAY", date(2025, 3, 13)),
+    ("WEEK", date(2025, 3, 10)),
+    ("MONTH", date(2025, 3, 1)),
+    ("YEAR", date(2025, 1, 1)),
+])
+def test_floor(interval, expected):
+    assert Partitions._floor(date(2025, 3, 13), interval) == expected
+
+
+def test_floor_week_starts_on_monday():
+    assert Partitions._floor(date(2025, 3, 10), "WEEK") == date(2025, 3, 10)
+    assert Partitions._floor(date(2025, 3, 16), "WEEK") == date(2025, 3, 10)
+
+
+@pytest.mark.parametrize("start, interval, count, expected", [
+    (date(2025, 2, 28), "DAY", 1, date(2025, 3, 1)),
+    (date(2024, 2, 28), "DAY", 1, date(2024, 2, 29)),
+    (date(2025, 3, 10), "WEEK", -2, date(2025, 2, 24)),
+    (date(2025, 11, 1), "MONTH", 1, date(2025, 12, 1)),
+    (date(2025, 11, 1), "MONTH", 2, date(2026, 1, 1)),
+    (date(2025, 1, 1), "MONTH", -1, date(2024, 12, 1)),
+    (date(2025, 3, 1), "MONTH", -12, date(2024, 3, 1)),
+    (date(2025, 3, 1), "MONTH", -15, date(2023, 12, 1)),
+    (date(2025, 3, 1), "MONTH", 25, date(2027, 4, 1)),
+    (date(2025, 1, 1), "YEAR", -3, date(2022, 1, 1)),
+])
+def test_shift(start, interval, count, expected):
+    assert Partitions._shift(start, interval, count) == expected
+
+
+@pytest.mark.parametrize("partition_name, expected", [
+    ("events_p20250301", date(2025, 3, 1)),
+    ("events_p20241231", date(2024, 12, 31)),
+    ("events_p2025030", None),
+    ("events_p202503011", None),
+    ("events_p20251301", None),
+    ("events_p20250230", None),
+    ("events_archive_p20250301", None),
+    ("other_p20250301", None),
+    ("events_default", None),
+])
+def test_start(partition_name, expected):
+    assert Partitions._start("events", partition_name) == expected
+
+
+def test_start_escapes_table_name():
+    assert Partitions._start("a.b", "a.b_p20250301") == date(2025, 3, 1)
+    assert Partitions._start("a.b", "axb_p20250301") is None